@@ -1,8 +1,10 @@
 import pandas as pd
 import mysql.connector
-import pytz
-import io
+import os
 import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
 import numpy as np
 
 # --- CONFIG ---
@@ -11,208 +13,335 @@ DB_CONFIG = {
     "host": "localhost",
     "user": "root",
     "password": "ictskills",
-    "database": "lawnmower_management"
+    "database": "lawnmower_management",
+    "use_pure": False,  # C extension packs parameters and packets natively
+    "allow_local_infile": True  # Tracking tables are bulk loaded with LOAD DATA LOCAL INFILE
 }
-LOCAL_TZ = pytz.timezone("Europe/Zurich")
+CHUNK_SIZE = 100_000
+BATCH_SIZE = 5000
+SERIAL_LOOKUP_SIZE = 1000
+# Opt in only when nothing replicates from this server and point-in-time recovery is not needed:
+# skipping the binary log (needs SYSTEM_VARIABLES_ADMIN) leaves the imported rows out of both.
+# innodb_flush_log_at_trx_commit = 2 in the server config also helps large loads, it cannot be set per session.
+SKIP_BINLOG = False
+LOCAL_TZ = ZoneInfo("Europe/Zurich")
+UTC = ZoneInfo("UTC")
+
+# Timezone suffix after a time of day that marks a timestamp string as tz-aware,
+# e.g. "10:00Z", "10:00:00 UTC", "10:00:00+02" or "10:00:00.5-05:00". Date-only values never match.
+TZ_SUFFIX_PATTERN = r'\d:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|UTC|GMT|[+-]\d{2}(?::?\d{2})?)$'
+
+# String placeholders pandas leaves behind for missing values in text columns
+NAN_STRINGS = {'nan', 'NaN', 'NaT', ''}
+
+# Pattern to match date formats with commas that break the CSV columns, e.g. "Jan 3, 2024"
+DATE_PATTERN = re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),\s+(\d{4})')
+MONTH_NUMBERS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+    'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+# Cheap prefilter, lines without any month name cannot contain such a date
+MONTH_PATTERN = re.compile(r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec')
+
+DATE_COLUMNS = ['PurchaseDate', 'LatestMaintenance', 'Timestamp']
+LAWNMOWER_COLUMNS = ['Name', 'AddressLine', 'PostalCode', 'City', 'Canton', 
+                     'HomeLatitude', 'HomeLongitude', 'SerialNumber', 'Vendor', 
+                     'Model', 'Firmware', 'PurchaseDate', 'LatestMaintenance', 'PortNumber']
+TRACKING_COLUMNS = ['SerialNumber', 'Timestamp', 'Latitude', 'Longitude', 'BatteryLevel', 'DeviceState']
+# Tracking tables with their LOAD DATA column lists, loaded in this order for each chunk
+TRACKING_TABLES = [
+    ("gps_positions", ["lawnmower_id", "timestamp", "latitude", "longitude"]),
+    ("battery_levels", ["lawnmower_id", "timestamp", "battery_level"]),
+    ("device_states", ["lawnmower_id", "timestamp", "state"])
+]
 
 # --- LOAD CSV ---
+def to_iso_date(match):
+    """Rewrite a "Jan 3, 2024" match as "2024-01-03" so pandas can parse it with a fixed format"""
+    month, day, year = match.groups()
+    return f"{year}-{MONTH_NUMBERS[month]}-{day.zfill(2)}"
+
 def preprocess_csv_content():
-    """Preprocess CSV to fix unescaped commas in date fields."""
-    with open(CSV_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Pattern to match date formats with commas that need to be quoted
-    date_pattern = r'(\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4})'
-    content = re.sub(date_pattern, r'"\1"', content)
-    return content
+    """Preprocess CSV to rewrite comma dates as ISO dates, streaming line by line."""
+    # Spill to disk once the preprocessed content grows past 64 MB
+    preprocessed = tempfile.SpooledTemporaryFile(max_size=64 << 20, mode='w+', encoding='utf-8', newline='')
+    with open(CSV_FILE, 'r', encoding='utf-8', newline='') as f:
+        for line in f:
+            if MONTH_PATTERN.search(line):
+                line = DATE_PATTERN.sub(to_iso_date, line)
+            preprocessed.write(line)
+    preprocessed.seek(0)
+    return preprocessed
+
+# --- PROCESS DATES ---
+def localize_to_utc(parsed):
+    """Convert a parsed datetime series to UTC, treating naive values as local time"""
+    if parsed.dt.tz is None:
+        parsed = parsed.dt.tz_localize(LOCAL_TZ, nonexistent="shift_forward", ambiguous="NaT")
+    return parsed.dt.tz_convert(UTC)
 
-# Get preprocessed content and load it
-preprocessed_content = preprocess_csv_content()
-df = pd.read_csv(io.StringIO(preprocessed_content))
+def parse_grouped_to_utc(text, is_aware):
+    """Parse tz-aware and naive timestamp strings as two groups, one pandas call each"""
+    utc_parts = [pd.Series(dtype="datetime64[ns, UTC]")]
+    if is_aware.any():
+        utc_parts.append(pd.to_datetime(text[is_aware], errors='coerce', format='mixed', utc=True))
+    if not is_aware.all():
+        utc_parts.append(localize_to_utc(pd.to_datetime(text[~is_aware], errors='coerce', format='mixed')))
+    # Both groups share one resolution so the concat stays datetime-typed
+    return pd.concat([part.astype("datetime64[ns, UTC]") for part in utc_parts]).reindex(text.index)
 
-print(f"Successfully loaded {len(df)} rows from CSV")
-print(f"Unique lawnmowers (serial numbers): {df['SerialNumber'].nunique()}")
+def process_date_column(series, column_name):
+    """Process a date column with multiple possible formats"""
+    # Timestamps repeat a lot, so parse and convert each distinct value only once
+    codes, unique_values = pd.factorize(series)
+    unique_values = pd.Series(unique_values)
+    if pd.api.types.is_datetime64_any_dtype(unique_values):
+        # Already parsed by read_csv
+        utc_dates = localize_to_utc(unique_values)
+    else:
+        # Split on an explicit offset so each group is parsed in a single call, pandas refuses
+        # to mix naive and tz-aware values (or offsets spanning DST) in one parse
+        text = unique_values.astype(str).str.strip()
+        is_aware = text.str.contains(TZ_SUFFIX_PATTERN).to_numpy()
+        try:
+            utc_dates = parse_grouped_to_utc(text, is_aware)
+        except ValueError:
+            # A timezone format the pattern does not know ended up in the naive group,
+            # classify the distinct values one at a time instead of aborting the import
+            is_aware = text.map(
+                lambda value: getattr(pd.to_datetime(value, errors='coerce'), 'tzinfo', None) is not None
+            ).to_numpy(dtype=bool)
+            utc_dates = parse_grouped_to_utc(text, is_aware)
+    
+    is_invalid = (utc_dates.isna() & ~unique_values.isin(NAN_STRINGS)).to_numpy()
+    invalid_count = int(is_invalid[codes[codes >= 0]].sum())
+    if invalid_count:
+        print(f"Could not process {invalid_count} dates in column {column_name}")
+    
+    # Naive datetimes already in UTC, the connector binds them natively without a strftime round trip
+    utc_datetimes = np.array(utc_dates.dt.tz_localize(None).dt.to_pydatetime(), dtype=object)
+    utc_datetimes[utc_dates.isna().to_numpy()] = None
+    # Missing values have code -1, which picks the trailing None
+    utc_datetimes = np.append(utc_datetimes, None)
+    return pd.Series(utc_datetimes[codes], index=series.index, dtype=object)
 
 # --- CLEAN DATA ---
 def clean_nan_values(df):
-    """Clean all types of NaN values"""
-    df = df.replace({np.nan: None})
-    for col in df.columns:
-        df[col] = df[col].replace({'nan': None, 'NaN': None, 'NaT': None, '': None})
-        df.loc[df[col] == 'nan', col] = None
-    return df
+    """Clean all types of NaN values in a single vectorized pass"""
+    # Numeric columns cannot hold placeholder strings, so only text columns are scanned
+    obj_cols = df.select_dtypes(include=['object', 'string']).columns
+    if len(obj_cols):
+        df[obj_cols] = df[obj_cols].mask(df[obj_cols].isin(NAN_STRINGS))
+    return df.astype(object).where(df.notna(), None)
 
-df = clean_nan_values(df)
+# --- PROCESS CHUNK ---
+def process_chunk(chunk):
+    """Normalize the dates of a CSV chunk to UTC and clean its NaN values"""
+    for col in DATE_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = process_date_column(chunk[col], col)
+    return clean_nan_values(chunk)
 
-# --- PROCESS DATES ---
-def process_date_column(series, column_name):
-    """Process a date column with multiple possible formats"""
-    processed_dates = []
+def split_chunk(chunk, seen_serials):
+    """Split a processed chunk into lawnmowers not seen before and tracking data"""
+    # Get unique lawnmowers (one per serial number, taking the first occurrence for static data)
+    unique_lawnmowers = chunk[LAWNMOWER_COLUMNS].groupby('SerialNumber', sort=False, as_index=False).first()
+    new_lawnmowers = unique_lawnmowers[~unique_lawnmowers['SerialNumber'].isin(seen_serials)]
     
-    for value in series:
-        if value is None or pd.isna(value):
-            processed_dates.append(None)
-            continue
-            
-        try:
-            parsed_date = pd.to_datetime(value, errors='coerce')
-            if pd.isna(parsed_date):
-                processed_dates.append(None)
-            else:
-                if parsed_date.tz is None:
-                    parsed_date = parsed_date.tz_localize(LOCAL_TZ, nonexistent="shift_forward", ambiguous="NaT")
-                parsed_date = parsed_date.tz_convert(pytz.UTC)
-                formatted_date = parsed_date.strftime("%Y-%m-%d %H:%M:%S")
-                processed_dates.append(formatted_date)
-        except Exception as e:
-            print(f"Error processing date '{value}' in column {column_name}: {e}")
-            processed_dates.append(None)
-    
-    return processed_dates
-
-# Process date columns
-date_columns = ['PurchaseDate', 'LatestMaintenance', 'Timestamp']
-for col in date_columns:
-    if col in df.columns:
-        print(f"Processing date column: {col}")
-        df[col] = process_date_column(df[col], col)
-
-# --- FINAL DATA CLEANUP ---
-def final_cleanup(df):
-    """Final cleanup to ensure no 'nan' strings remain"""
-    for col in df.columns:
-        mask = df[col].astype(str).str.lower() == 'nan'
-        df.loc[mask, col] = None
-        df[col] = df[col].replace('', None)
-    return df
-
-df = final_cleanup(df)
-print("Data processing complete")
-
-# --- SEPARATE UNIQUE LAWNMOWERS FROM TRACKING DATA ---
-# Get unique lawnmowers (one per serial number, taking the first occurrence for static data)
-lawnmower_columns = ['Name', 'AddressLine', 'PostalCode', 'City', 'Canton', 
-                    'HomeLatitude', 'HomeLongitude', 'SerialNumber', 'Vendor', 
-                    'Model', 'Firmware', 'PurchaseDate', 'LatestMaintenance', 'PortNumber']
-
-unique_lawnmowers = df[lawnmower_columns].drop_duplicates(subset=['SerialNumber'], keep='first')
-print(f"Found {len(unique_lawnmowers)} unique lawnmowers")
-
-# Tracking data includes timestamp, GPS, battery, device state
-tracking_data = df[['SerialNumber', 'Timestamp', 'Longitude', 'Latitude', 'DeviceState', 'BatteryLevel']].copy()
-tracking_data = tracking_data.dropna(subset=['Timestamp'])  # Only keep rows with valid timestamps
-print(f"Found {len(tracking_data)} tracking records")
+    # Tracking data includes timestamp, GPS, battery, device state
+    tracking_data = chunk[TRACKING_COLUMNS].dropna(subset=['Timestamp'])  # Only keep rows with valid timestamps
+    return new_lawnmowers, tracking_data
+
+# --- BATCHED INSERTS ---
+def insert_batched(cursor, insert_sql, rows, suffix=""):
+    """Insert rows as multi-row VALUES statements, BATCH_SIZE rows at a time"""
+    if not rows:
+        return 0
+    placeholder = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+    full_batch_values = ", ".join([placeholder] * BATCH_SIZE)
+    
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        if len(batch) == BATCH_SIZE:
+            values = full_batch_values
+        else:
+            values = ", ".join([placeholder] * len(batch))
+        params = [value for row in batch for value in row]
+        cursor.execute(insert_sql + values + suffix, params)
+    
+    return len(rows)
+
+def infile_field(value):
+    """Format a value for LOAD DATA's default tab-separated, backslash-escaped layout"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, float) and value.is_integer():
+        # "80.0" into an integer column is a truncation warning, which load_data_infile treats as an error
+        value = int(value)
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def load_data_infile(cursor, table, columns, rows):
+    """Bulk load rows into a table through a temporary TSV file and a single LOAD DATA statement"""
+    if not rows:
+        return 0
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', encoding='utf-8', newline='\n', delete=False) as f:
+        for row in rows:
+            f.write("\t".join([infile_field(value) for value in row]) + "\n")
+        infile_path = f.name
+    
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (infile_path,)
+        )
+        # LOCAL implies IGNORE, so bad rows (e.g. NULL into NOT NULL, invalid ENUM) only raise warnings
+        cursor.execute("SHOW WARNINGS")
+        warnings = [(level, code, message) for level, code, message in cursor.fetchall() if level != 'Note']
+        if warnings:
+            # SHOW WARNINGS is capped by the server's max_error_count, so this is a lower bound
+            raise ValueError(f"LOAD DATA into {table} reported at least {len(warnings)} warnings, first ones: {warnings[:5]}")
+    finally:
+        os.remove(infile_path)
+    
+    return len(rows)
+
+def upsert_lawnmowers(cursor, lawnmowers):
+    """Insert or update lawnmowers, returns the number of rows sent"""
+    # LAWNMOWER_COLUMNS is already in the INSERT column order
+    lawnmower_rows = []
+    for row in lawnmowers[LAWNMOWER_COLUMNS].itertuples(index=False, name=None):
+        lawnmower_rows.append(row + ("UTC",))
+    
+    return insert_batched(cursor, """
+        INSERT INTO lawnmowers (
+            name, address, postal_code, city, canton, 
+            home_latitude, home_longitude, serial_number, 
+            vendor, model, firmware_version, purchase_date, 
+            latest_maintenance, port_number, timezone
+        ) VALUES """, lawnmower_rows, """
+        ON DUPLICATE KEY UPDATE 
+            name = VALUES(name),
+            address = VALUES(address),
+            latest_maintenance = VALUES(latest_maintenance),
+            updated_at = CURRENT_TIMESTAMP
+    """)
+
+def lookup_lawnmower_ids(cursor, serials):
+    """Map serial numbers to lawnmower ids, querying only the given serials"""
+    lawnmower_map = {}
+    for start in range(0, len(serials), SERIAL_LOOKUP_SIZE):
+        serial_batch = serials[start:start + SERIAL_LOOKUP_SIZE]
+        cursor.execute(
+            "SELECT id, serial_number FROM lawnmowers WHERE serial_number IN ("
+            + ", ".join(["%s"] * len(serial_batch)) + ")",
+            serial_batch
+        )
+        lawnmower_map.update({serial: id for id, serial in cursor.fetchall()})
+    return lawnmower_map
+
+def build_tracking_rows(tracking_data, lawnmower_map):
+    """Build the GPS, battery and device state rows for a chunk of tracking data"""
+    # Attach lawnmower ids with one join, rows with unknown serials drop out here
+    lawnmower_ids = pd.DataFrame(list(lawnmower_map.items()), columns=['SerialNumber', 'lawnmower_id'])
+    tracking_rows = tracking_data.merge(lawnmower_ids, on='SerialNumber', how='inner')
+    
+    # Pull each column out once as a flat array and zip, instead of copying row blocks per table
+    lawnmower_id_col, timestamp_col, latitude_col, longitude_col, state_col = [
+        tracking_rows[col].to_numpy()
+        for col in ['lawnmower_id', 'Timestamp', 'Latitude', 'Longitude', 'DeviceState']
+    ]
+    gps_rows = list(zip(lawnmower_id_col.tolist(), timestamp_col, latitude_col, longitude_col))
+    # Battery level and device state only where available
+    has_battery = tracking_rows['BatteryLevel'].notna().to_numpy()
+    # battery_level is a TINYINT, round here since LOAD DATA would only warn on "55.5"
+    battery_col = pd.to_numeric(tracking_rows['BatteryLevel']).round().to_numpy()
+    battery_rows = list(zip(lawnmower_id_col[has_battery].tolist(), timestamp_col[has_battery], battery_col[has_battery].tolist()))
+    has_state = tracking_rows['DeviceState'].notna().to_numpy()
+    state_rows = list(zip(lawnmower_id_col[has_state].tolist(), timestamp_col[has_state], state_col[has_state]))
+    return gps_rows, battery_rows, state_rows
+
+def load_tracking_rows(cursor, tracking_rows):
+    """Load a chunk's tracking rows into their tables one after another on the import connection"""
+    # Tracking rows only reference ids read back from lawnmowers, so skip per-row checks for the loads.
+    # unique_checks has to be back on for the next lawnmower upsert, which relies on the serial_number key.
+    cursor.execute("SET SESSION unique_checks = 0")
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    try:
+        for (table, columns), rows in zip(TRACKING_TABLES, tracking_rows):
+            try:
+                load_data_infile(cursor, table, columns, rows)
+            except Exception as e:
+                print(f"Error loading tracking data into {table}: {e}")
+                raise
+    finally:
+        cursor.execute("SET SESSION unique_checks = 1")
+        cursor.execute("SET SESSION foreign_key_checks = 1")
+
+def insert_chunk(cursor, new_lawnmowers, tracking_data, lawnmower_map):
+    """Insert one chunk's lawnmowers and tracking rows into the open import transaction"""
+    # --- INSERT UNIQUE LAWNMOWERS ---
+    try:
+        lawnmower_count = upsert_lawnmowers(cursor, new_lawnmowers)
+    except Exception as e:
+        print(f"Error inserting lawnmowers: {e}")
+        raise
+    
+    # Get lawnmower IDs to link tracking data (only for the serials we just upserted)
+    lawnmower_map.update(lookup_lawnmower_ids(cursor, new_lawnmowers['SerialNumber'].tolist()))
+    
+    # --- INSERT GPS TRACKING DATA ---
+    tracking_rows = build_tracking_rows(tracking_data, lawnmower_map)
+    load_tracking_rows(cursor, tracking_rows)
+    return lawnmower_count, len(tracking_rows[0])
 
 # --- DB CONNECTION ---
-conn = mysql.connector.connect(**DB_CONFIG)
+conn = mysql.connector.connect(**DB_CONFIG, autocommit=False)
 cursor = conn.cursor()
 
 try:
+    # sql_log_bin cannot be changed inside a transaction
+    if SKIP_BINLOG:
+        cursor.execute("SET SESSION sql_log_bin = 0")
+    # Every chunk goes into this one transaction, so the import is committed or rolled back as a whole
     conn.start_transaction()
     
-    # --- INSERT UNIQUE LAWNMOWERS ---
-    print("Inserting unique lawnmowers...")
     lawnmower_insert_count = 0
-    
-    for _, row in unique_lawnmowers.iterrows():
-        try:
-            cursor.execute("""
-                INSERT INTO lawnmowers (
-                    name, address, postal_code, city, canton, 
-                    home_latitude, home_longitude, serial_number, 
-                    vendor, model, firmware_version, purchase_date, 
-                    latest_maintenance, port_number, timezone
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE 
-                    name = VALUES(name),
-                    address = VALUES(address),
-                    latest_maintenance = VALUES(latest_maintenance),
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                row.get("Name"),
-                row.get("AddressLine"),
-                row.get("PostalCode"),
-                row.get("City"),
-                row.get("Canton"),
-                row.get("HomeLatitude"),
-                row.get("HomeLongitude"),
-                row.get("SerialNumber"),
-                row.get("Vendor"),
-                row.get("Model"),
-                row.get("Firmware"),
-                row.get("PurchaseDate"),
-                row.get("LatestMaintenance"),
-                row.get("PortNumber"),
-                "UTC"
-            ))
-            lawnmower_insert_count += 1
-            
-        except Exception as e:
-            print(f"Error inserting lawnmower {row.get('SerialNumber')}: {e}")
-            raise
-    
-    print(f"Successfully inserted/updated {lawnmower_insert_count} lawnmowers")
-    
-    # --- INSERT GPS TRACKING DATA ---
-    print("Inserting GPS tracking data...")
     gps_insert_count = 0
+    row_count = 0
+    seen_serials = set()
+    lawnmower_map = {}
     
-    # First, get lawnmower IDs to link tracking data
-    cursor.execute("SELECT id, serial_number FROM lawnmowers")
-    lawnmower_map = {serial: id for id, serial in cursor.fetchall()}
-    
-    for _, row in tracking_data.iterrows():
-        try:
-            serial_number = row.get('SerialNumber')
-            lawnmower_id = lawnmower_map.get(serial_number)
+    # Each chunk is inserted right away, while its inserts run the next chunk is parsed. A single
+    # worker does all the database work, so the connection is only ever used by one thread.
+    pending_chunk = None
+    with preprocess_csv_content() as preprocessed_csv, ThreadPoolExecutor(max_workers=1) as executor:
+        # Date-only columns are parsed by the C parser
+        chunks = pd.read_csv(preprocessed_csv, chunksize=CHUNK_SIZE,
+                             parse_dates=['PurchaseDate', 'LatestMaintenance'], date_format='%Y-%m-%d')
+        for chunk_number, chunk in enumerate(chunks, start=1):
+            print(f"Processing chunk {chunk_number} ({len(chunk)} rows)...")
+            row_count += len(chunk)
+            chunk = process_chunk(chunk)
+            new_lawnmowers, tracking_data = split_chunk(chunk, seen_serials)
+            seen_serials.update(new_lawnmowers['SerialNumber'].tolist())
             
-            if lawnmower_id:
-                cursor.execute("""
-                    INSERT INTO gps_positions (
-                        lawnmower_id, timestamp, latitude, longitude
-                    ) VALUES (%s, %s, %s, %s)
-                """, (
-                    lawnmower_id,
-                    row.get('Timestamp'),
-                    row.get('Latitude'),
-                    row.get('Longitude')
-                ))
-                
-                # Insert battery level if available
-                if row.get('BatteryLevel') is not None:
-                    cursor.execute("""
-                        INSERT INTO battery_levels (
-                            lawnmower_id, timestamp, battery_level
-                        ) VALUES (%s, %s, %s)
-                    """, (
-                        lawnmower_id,
-                        row.get('Timestamp'),
-                        row.get('BatteryLevel')
-                    ))
-                
-                # Insert device state if available
-                if row.get('DeviceState') is not None:
-                    cursor.execute("""
-                        INSERT INTO device_states (
-                            lawnmower_id, timestamp, state
-                        ) VALUES (%s, %s, %s)
-                    """, (
-                        lawnmower_id,
-                        row.get('Timestamp'),
-                        row.get('DeviceState')
-                    ))
-                
-                gps_insert_count += 1
-                if gps_insert_count % 100 == 0:
-                    print(f"Processed {gps_insert_count} tracking records...")
-                    
-        except Exception as e:
-            print(f"Error inserting tracking data for {serial_number}: {e}")
-            raise
+            # Keep at most one chunk in flight and surface its errors before queueing the next
+            if pending_chunk is not None:
+                lawnmower_count, gps_count = pending_chunk.result()
+                lawnmower_insert_count += lawnmower_count
+                gps_insert_count += gps_count
+            pending_chunk = executor.submit(insert_chunk, cursor, new_lawnmowers, tracking_data, lawnmower_map)
+        
+        if pending_chunk is not None:
+            lawnmower_count, gps_count = pending_chunk.result()
+            lawnmower_insert_count += lawnmower_count
+            gps_insert_count += gps_count
     
+    print(f"Successfully loaded {row_count} rows from CSV")
+    print(f"Successfully inserted/updated {lawnmower_insert_count} lawnmowers")
     print(f"Successfully inserted {gps_insert_count} tracking records")
     
-    # Commit the transaction
     conn.commit()
     print("SUCCESS! All data imported successfully!")
     print(f"Summary:")
@@ -221,11 +350,15 @@ try:
     
 except Exception as e:
     print(f"Error during import: {e}")
-    conn.rollback()
-    print("Transaction rolled back")
+    try:
+        conn.rollback()
+        print("Transaction rolled back")
+    except Exception as rollback_error:
+        # The server discards the uncommitted transaction when the connection closes
+        print(f"Rollback failed: {rollback_error}")
     
 finally:
     cursor.close()
     conn.close()
 
-print("Database connection closed. Script complete.")
\ No newline at end of file
+print("Database connection closed. Script complete.")